@@ -0,0 +1,15 @@
+# shared_http.py - WebExtract Pro pooled HTTP session for calls between local services
+import requests
+from requests.adapters import HTTPAdapter
+
+def create_session():
+    """Create a keep-alive session that reuses connections to the local services.
+
+    Requests are not retried: callers poll (startup readiness) or report the
+    service offline (dashboard health), so a retry would only delay the answer.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
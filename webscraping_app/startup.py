@@ -3,9 +3,21 @@ import subprocess
 import time
 import os
 import sys
+import selectors
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 
+import requests
+
+from shared_http import create_session
+
+# How long a service may take to start accepting connections
+SERVICE_READY_TIMEOUT = 30
+
+# Shared keep-alive session for all HTTP calls to the local services
+SESSION = create_session()
+
 def print_banner():
     """Print startup banner"""
     print("=" * 60)
@@ -22,6 +34,7 @@ def check_dependencies():
     """Check if required files exist"""
     required_files = [
         'shared_db.py',
+        'shared_http.py',
         'webapp.py',
         'workers/kilimall/kilimall_worker.py',
         'workers/jumia/jumia_worker.py'
@@ -42,7 +55,7 @@ def check_dependencies():
     return True
 
 def start_service(service_name, script_path, port, cwd=None):
-    """Start a service in a separate process"""
+    """Start a service in a separate process without waiting for it to come up"""
     try:
         print(f"[START] Starting {service_name}...")
 
@@ -56,34 +69,91 @@ def start_service(service_name, script_path, port, cwd=None):
             universal_newlines=True
         )
 
-        # Give service time to start
-        time.sleep(2)
-
-        # Check if process is still running
-        if process.poll() is None:
-            print(f"[SUCCESS] {service_name} started successfully on port {port}")
-            return process
-        else:
-            print(f"[ERROR] {service_name} failed to start (exited immediately)")
-            return None
+        return process
 
     except Exception as e:
         print(f"[ERROR] Error starting {service_name}: {str(e)}")
         return None
 
+def wait_for_service(service_name, process, port, timeout=SERVICE_READY_TIMEOUT):
+    """Wait until a started service answers its /api/health endpoint"""
+    if process is None:
+        return False
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            print(f"[ERROR] {service_name} failed to start (exited immediately)")
+            return False
+
+        try:
+            response = SESSION.get(f"http://127.0.0.1:{port}/api/health", timeout=0.5)
+            if response.ok:
+                print(f"[SUCCESS] {service_name} started successfully on port {port}")
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.1)
+
+    print(f"[ERROR] {service_name} did not become healthy on port {port} within {timeout}s")
+    return False
+
+def open_pidfds(running):
+    """Open a pidfd per running service, or return None if pidfds are unavailable"""
+    if not hasattr(os, 'pidfd_open'):
+        return None
+    pidfds = {}
+    try:
+        for name, process in running.items():
+            pidfds[os.pidfd_open(process.pid)] = name
+    except OSError:
+        # Kernel older than 5.3, seccomp filter, or the child was already reaped
+        for fd in pidfds:
+            os.close(fd)
+        return None
+    return pidfds
+
+def iter_service_exits(running):
+    """Yield the name of each running service as soon as its process exits"""
+    pidfds = open_pidfds(running)
+    if pidfds is not None:
+        # Linux: a pidfd becomes readable when the child exits, so select() sleeps until then
+        with selectors.DefaultSelector() as selector:
+            for fd, name in pidfds.items():
+                selector.register(fd, selectors.EVENT_READ, name)
+            try:
+                while selector.get_map():
+                    for key, _ in selector.select():
+                        selector.unregister(key.fd)
+                        os.close(key.fd)
+                        running[key.data].wait()  # Reap the exited child so it doesn't linger as a zombie
+                        yield key.data
+            finally:
+                for key in list(selector.get_map().values()):
+                    os.close(key.fd)
+    else:
+        # Elsewhere: one watcher thread per process blocked in process.wait(), which also reaps it
+        executor = ThreadPoolExecutor(max_workers=len(running))
+        futures = {executor.submit(process.wait): name for name, process in running.items()}
+        pending = set(futures)
+        while pending:
+            # The timeout only keeps Ctrl+C responsive on Windows, where lock waits can't be interrupted
+            done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield futures[future]
+        executor.shutdown(wait=False)
+
 def monitor_services(processes):
     """Monitor running services"""
     print("\n[MONITOR] Monitoring services... (Press Ctrl+C to stop all)")
     
     try:
-        while True:
-            time.sleep(10)
-            
-            # Check if any process has died
-            for name, process in processes.items():
-                if process and process.poll() is not None:
-                    print(f"[WARNING] {name} has stopped unexpectedly")
-                    
+        running = {name: process for name, process in processes.items() if process and process.poll() is None}
+        for name in iter_service_exits(running):
+            print(f"[WARNING] {name} has stopped unexpectedly")
+
+        print("[WARNING] All services have stopped")
+
     except KeyboardInterrupt:
         print("\n[STOP] Stopping all services...")
 
@@ -118,34 +188,26 @@ def main():
     
     print("[CONFIG] Starting WebExtract Pro services...\n")
     
-    # Store process references
+    # (service name, script, port, working directory)
+    services = [
+        ("WebApp (Dashboard)", "webapp.py", 8000, None),
+        ("Kilimall Worker", "kilimall_worker.py", 5001, "workers/kilimall"),  # Selenium-based
+        ("Jumia Worker", "jumia_worker.py", 5000, "workers/jumia"),  # HTTP-based
+    ]
+
+    # Launch every service up front, then wait for all of them concurrently
     processes = {}
-    
-    # Start main webapp
-    processes['WebApp (Dashboard)'] = start_service(
-        "WebApp (Dashboard)",
-        "webapp.py",
-        8000
-    )
-
-    # Start Kilimall worker (Selenium-based)
-    processes['Kilimall Worker'] = start_service(
-        "Kilimall Worker",
-        "kilimall_worker.py",
-        5001,
-        cwd="workers/kilimall"
-    )
-
-    # Start Jumia worker (HTTP-based)
-    processes['Jumia Worker'] = start_service(
-        "Jumia Worker",
-        "jumia_worker.py",
-        5000,
-        cwd="workers/jumia"
-    )
-    
+    for name, script_path, port, cwd in services:
+        processes[name] = start_service(name, script_path, port, cwd=cwd)
+
+    with ThreadPoolExecutor(max_workers=len(services)) as executor:
+        ready = dict(zip(
+            processes,
+            executor.map(lambda service: wait_for_service(service[0], processes[service[0]], service[2]), services)
+        ))
+
     # Check if all services started
-    failed_services = [name for name, process in processes.items() if process is None]
+    failed_services = [name for name, is_ready in ready.items() if not is_ready]
     
     if failed_services:
         print(f"\n[ERROR] Failed to start: {', '.join(failed_services)}")
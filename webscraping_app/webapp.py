@@ -3,10 +3,10 @@ from flask import Flask, send_from_directory, request, jsonify, redirect, url_fo
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required, create_access_token, get_jwt_identity
 from datetime import datetime, timedelta
-import requests
 import json
 import os
 from shared_db import db, User, ScrapingSession, DatabaseManager
+from shared_http import create_session
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'webextract-pro-secret-key-2025'
@@ -39,6 +39,9 @@ WORKERS = {
     }
 }
 
+# Shared keep-alive session for calls to the workers
+SESSION = create_session()
+
 # Initialize database tables and admin user (Fixed for modern Flask)
 @app.before_request
 def initialize_database():
@@ -372,7 +375,7 @@ def worker_health():
     
     for worker_name, worker_config in WORKERS.items():
         try:
-            response = requests.get(f"{worker_config['url']}/api/health", timeout=5)
+            response = SESSION.get(f"{worker_config['url']}/api/health", timeout=5)
             health_status[worker_name] = {
                 'status': 'online' if response.status_code == 200 else 'offline',
                 'url': worker_config['url'],
@@ -394,7 +397,7 @@ def worker_stats():
     
     for worker_name, worker_config in WORKERS.items():
         try:
-            response = requests.get(f"{worker_config['url']}/api/stats", timeout=5)
+            response = SESSION.get(f"{worker_config['url']}/api/stats", timeout=5)
             if response.status_code == 200:
                 worker_stats[worker_name] = response.json()
             else:
@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 """
-Kilimall Web Scraper - SEQUENTIAL VERSION
-Fixed to prevent hanging and resource issues.
+Kilimall Web Scraper - PARALLEL VERSION
+Listing pages are scraped concurrently on a small pool of warm Chrome drivers.
 """
 
-import json
+import asyncio
+import atexit
 import csv
 import time
 import random
@@ -12,24 +13,164 @@ import re
 import argparse
 import logging
 import os
-from dataclasses import dataclass
+import queue
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from types import MappingProxyType
 from typing import List, Optional
 from urllib.parse import urljoin
 
+import msgspec
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selectolax.parser import HTMLParser
+
+# Optional HTTP-only scraping stack (see AsyncKilimallScraper)
+try:
+    import httpx
+except ImportError:
+    httpx = None
+ASYNC_SCRAPER_AVAILABLE = httpx is not None
+
+# httpx only speaks HTTP/2 when the h2 package is installed (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Optional multi-pattern brand matcher (falls back to a linear scan)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-@dataclass
-class Product:
-    """Data class to represent a product"""
+# CSS selectors from real Kilimall HTML; shared by every scraper instance
+_SELECTORS = MappingProxyType({
+    'product_containers': '.listing-item .product-item',
+    'product_title': '.product-title',
+    'product_price': '.product-price',
+    'old_price': '.old-price, .original-price, [class*="old"], [class*="original"]',
+    'discount': '.discount, .discount-tag, [class*="discount"], .percentage-off',
+    'product_image': '.product-image img',
+    'product_link': 'a[href*="/listing/"]',
+    'rating_container': '.rate .van-rate',
+    'reviews_count': '.reviews',
+    'shipping_badge': '.logistics-tag .tag-name',
+    'product_list': '.listings'
+})
+
+_REVIEWS_RE = re.compile(r'\((\d+)\)')
+_PAGE_PARAM_RE = re.compile(r'[&?]page=\d+')
+
+def _category_page_urls(category_url: str, max_pages: int) -> List[str]:
+    """Build the URLs of pages 1..max_pages of a category listing."""
+    # Remove any existing page parameter once, then add each page number
+    base_url = _PAGE_PARAM_RE.sub('', category_url)
+    separator = '&' if '?' in base_url else '?'
+    url_template = f"{base_url}{separator}page={{page}}"
+    return [url_template.format(page=page) for page in range(1, max_pages + 1)]
+
+def _normalize_text(text: str) -> str:
+    """Collapse runs of whitespace to single spaces, as the browser's innerText would."""
+    return ' '.join(text.split())
+
+_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+# Third-party trackers and static assets that product extraction never needs.
+# Image src attributes still populate in the DOM when the request itself is blocked.
+_BLOCKED_URL_PATTERNS = [
+    '*google-analytics.com*', '*googletagmanager.com*', '*facebook.net*',
+    '*doubleclick.net*', '*hotjar.com*',
+    '*.png', '*.jpg', '*.webp', '*.gif', '*.woff*'
+]
+
+# Warm headless Chrome instances reused across KilimallScraper runs.
+# Each one holds ~300MB RSS, so the number of live drivers (pooled or in use)
+# is capped by _DRIVER_SLOTS; the idle pool can hold all of them.
+_DRIVER_POOL_MAX_SIZE = int(os.environ.get('KILIMALL_DRIVER_POOL_SIZE', '3'))
+_DRIVER_POOL = queue.LifoQueue(maxsize=_DRIVER_POOL_MAX_SIZE)
+_DRIVER_SLOTS = threading.BoundedSemaphore(_DRIVER_POOL_MAX_SIZE)
+
+def _quit_driver(driver):
+    """Quit a driver, ignoring errors from an already-dead browser."""
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.warning(f"Error during driver.quit(): {e}")
+
+def _retire_driver(driver):
+    """Quit a driver obtained from KilimallScraper.acquire and free its slot."""
+    _quit_driver(driver)
+    _DRIVER_SLOTS.release()
+
+def _drain_driver_pool():
+    """Quit every pooled driver. Registered with atexit."""
+    while True:
+        try:
+            driver = _DRIVER_POOL.get_nowait()
+        except queue.Empty:
+            return
+        _retire_driver(driver)
+
+atexit.register(_drain_driver_pool)
+
+# urllib3 pool size for WebDriver commands; Selenium's default of 1 serializes them
+_COMMAND_POOL_MAXSIZE = 20
+
+def _widen_command_pool(driver, maxsize: int = _COMMAND_POOL_MAXSIZE):
+    """Raise the connection pool size the driver uses to talk to chromedriver."""
+    pool_manager = getattr(driver.command_executor, '_conn', None)
+    if pool_manager is None:  # keep_alive disabled, a new connection per command anyway
+        return
+    pool_manager.connection_pool_kw['maxsize'] = maxsize
+    # Drop the size-1 pool opened by newSession; it is rebuilt lazily with the new size
+    pool_manager.clear()
+
+# Scrolls to the bottom until the page stops growing, all inside the browser, so the whole
+# lazy-load loop costs one WebDriver round-trip. arguments: (max_scrolls, settle_ms, callback);
+# calls back with the number of scrolls that loaded more content.
+_SCROLL_TO_END_JS = """
+const [maxScrolls, settleMs, done] = arguments;
+let lastHeight = document.body.scrollHeight;
+let scrolls = 0;
+const scroll = () => {
+    window.scrollTo(0, document.body.scrollHeight);
+    const started = Date.now();
+    const poll = () => {
+        const height = document.body.scrollHeight;
+        if (height !== lastHeight) {
+            lastHeight = height;
+            if (++scrolls >= maxScrolls) {
+                done(scrolls);
+            } else {
+                scroll();
+            }
+        } else if (Date.now() - started >= settleMs) {
+            done(scrolls);
+        } else {
+            setTimeout(poll, 100);
+        }
+    };
+    setTimeout(poll, 100);
+};
+scroll();
+"""
+
+class Product(msgspec.Struct):
+    """Data class to represent a product (slotted, C-level JSON encoding)"""
     name: str
     price: str
     original_price: str
@@ -44,36 +185,34 @@ class Product:
     badges: List[str]
 
 class KilimallScraper:
-    def __init__(self, headless: bool = True, delay_range: tuple = (2, 4)):
+    def __init__(self, headless: bool = True, delay_range: tuple = (2, 4), max_workers: int = 3):
         self.base_url = "https://www.kilimall.co.ke"
         self.delay_range = delay_range
+        self.max_workers = max_workers  # Pages (and Chrome drivers) scraped in parallel
         self.driver = None
         self.wait = None
         self.headless = headless
         
-        self.selectors = {
-            'product_containers': '.listing-item .product-item',
-            'product_title': '.product-title',
-            'product_price': '.product-price',
-            'product_image': '.product-image img',
-            'product_link': 'a[href*="/listing/"]',
-            'rating_container': '.rate .van-rate',
-            'reviews_count': '.reviews',
-            'shipping_badge': '.logistics-tag .tag-name',
-            'product_list': '.listings'
-        }
+        self.selectors = _SELECTORS
         
         self.known_brands = [
             'VITRON', 'SAMSUNG', 'XIAOMI', 'INFINIX', 'TECNO', 'ITEL', 'OPPO', 'REALME',
             'TAGWOOD', 'HISENSE', 'TCL', 'SONAR', 'AILYONS', 'AMTEC', 'GENERIC',
             'NOKIA', 'HUAWEI', 'APPLE', 'ONEPLUS', 'POCO', 'BLACKVIEW', 'RAMTONS'
         ]
-
-    def setup_driver(self):
-        """Initialize Chrome driver with appropriate options and timeout."""
-        import signal
-        from contextlib import contextmanager
-
+        self._brands_tuple = tuple(self.known_brands)
+
+        # Match every known brand in one pass over the title
+        self._brand_automaton = None
+        if ahocorasick is not None:
+            self._brand_automaton = ahocorasick.Automaton()
+            for brand in self._brands_tuple:
+                self._brand_automaton.add_word(brand.upper(), brand)
+            self._brand_automaton.make_automaton()
+
+    @classmethod
+    def _create_driver(cls, headless: bool = True):
+        """Launch a new Chrome driver with appropriate options and timeouts."""
         @contextmanager
         def timeout_context(seconds):
             """Context manager for timeout"""
@@ -93,9 +232,10 @@ class KilimallScraper:
                 # Windows doesn't have SIGALRM, so just proceed without timeout
                 yield
 
+        driver = None
         try:
             chrome_options = Options()
-            if self.headless:
+            if headless:
                 chrome_options.add_argument('--headless=new')
 
             # Add stability options
@@ -131,6 +271,9 @@ class KilimallScraper:
             chrome_options.add_argument('--password-store=basic')
             chrome_options.add_argument('--use-mock-keychain')
 
+            # Only text and image URLs are scraped, so skip downloading the images themselves
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
             chrome_options.add_experimental_option('prefs', {
@@ -139,203 +282,191 @@ class KilimallScraper:
                     'media_stream': 2,
                     'media_stream_mic': 2,
                     'media_stream_camera': 2
-                }
+                },
+                # Stylesheets stay enabled: lazy loading relies on the rendered layout
+                'profile.managed_default_content_settings.images': 2,
+                'profile.managed_default_content_settings.fonts': 2
             })
 
-            chrome_options.add_argument(
-                '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
-                '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            )
+            chrome_options.add_argument(f'--user-agent={_USER_AGENT}')
 
             logger.info("Initializing Chrome driver...")
 
             # Try to initialize with a reasonable timeout
             try:
-                self.driver = webdriver.Chrome(options=chrome_options)
+                driver = webdriver.Chrome(options=chrome_options)
                 logger.info("Chrome driver created successfully")
             except Exception as e:
                 logger.error(f"Failed to create Chrome driver: {e}")
-                # Try to kill any zombie Chrome processes
+                # Retry the launch once. Never kill chrome/chromedriver by image name here:
+                # that would take down pooled drivers and ones other threads are using.
                 try:
-                    import subprocess
-                    if os.name == 'nt':  # Windows
-                        subprocess.run(['taskkill', '/F', '/IM', 'chrome.exe', '/T'],
-                                     capture_output=True, timeout=5)
-                        subprocess.run(['taskkill', '/F', '/IM', 'chromedriver.exe', '/T'],
-                                     capture_output=True, timeout=5)
-                    logger.info("Cleaned up zombie Chrome processes, retrying...")
+                    logger.info("Retrying Chrome driver launch...")
                     time.sleep(2)
-                    self.driver = webdriver.Chrome(options=chrome_options)
+                    driver = webdriver.Chrome(options=chrome_options)
                 except Exception as retry_error:
                     logger.error(f"Retry also failed: {retry_error}")
                     raise
 
             # Configure driver after creation
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            _widen_command_pool(driver)
+
+            # Drop blocked requests before they hit the network
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
+            except WebDriverException as e:
+                logger.warning(f"Could not enable request blocking: {e}")
+
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
 
             # Set timeouts to prevent hanging
-            self.driver.set_page_load_timeout(30)
-            self.driver.implicitly_wait(10)
-            self.wait = WebDriverWait(self.driver, 15)
+            driver.set_page_load_timeout(30)
+            driver.implicitly_wait(10)
 
             logger.info("Chrome driver initialized successfully")
+            return driver
 
         except Exception as e:
             logger.error(f"Failed to initialize Chrome driver: {e}")
             # Make sure to clean up if initialization failed
-            if hasattr(self, 'driver') and self.driver:
+            if driver:
                 try:
-                    self.driver.quit()
+                    driver.quit()
                 except:
                     pass
             raise
 
-    def wait_for_page_load(self):
-        """Wait for Vue.js content to load by checking for the product list."""
+    @classmethod
+    def acquire(cls, headless: bool = True, block: bool = True):
+        """Take a warm driver from the pool, or launch a new one if none is available.
+
+        Only headless drivers are pooled; a visible browser is always launched fresh.
+        At most _DRIVER_POOL_MAX_SIZE drivers are live at once. When the cap is reached
+        this waits for another scraper to release one, or returns None if block is False.
+        """
+        while True:
+            if headless:
+                try:
+                    driver = _DRIVER_POOL.get_nowait()
+                except queue.Empty:
+                    driver = None
+                if driver is not None:
+                    try:
+                        driver.current_url  # Liveness check - raises if the browser died while pooled
+                        logger.info("Reusing pooled Chrome driver")
+                        return driver
+                    except WebDriverException:
+                        logger.warning("Discarding dead pooled Chrome driver")
+                        _retire_driver(driver)
+                        continue
+
+            if _DRIVER_SLOTS.acquire(blocking=False):
+                try:
+                    return cls._create_driver(headless)
+                except Exception:
+                    _DRIVER_SLOTS.release()
+                    raise
+
+            if not block:
+                return None
+
+            # Cap reached: wait for a driver to come back to the pool (or a slot to free up)
+            try:
+                idle = _DRIVER_POOL.get(timeout=1)
+            except queue.Empty:
+                continue
+            if headless:
+                _DRIVER_POOL.put_nowait(idle)  # Picked up on the next pass
+            else:
+                _retire_driver(idle)  # Make room for a visible browser
+
+    @classmethod
+    def release(cls, driver, headless: bool = True):
+        """Reset a driver and return it to the pool, quitting it if it can't be reused."""
+        if headless:
+            try:
+                driver.delete_all_cookies()
+                driver.get("about:blank")
+                _DRIVER_POOL.put_nowait(driver)
+                return
+            except queue.Full:
+                pass
+            except WebDriverException as e:
+                logger.warning(f"Could not reset driver for reuse: {e}")
+        _retire_driver(driver)
+
+    def setup_driver(self):
+        """Attach a Chrome driver (pooled when headless) to this scraper."""
+        self.driver = self.acquire(self.headless)
+        self.wait = WebDriverWait(self.driver, 15)
+
+    def wait_for_page_load(self, driver=None):
+        """Wait for Vue.js content to load by checking for rendered product cards."""
+        wait = WebDriverWait(driver, 15) if driver else self.wait
         try:
-            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, self.selectors['product_list'])))
-            time.sleep(2)  # Extra wait for dynamic content to settle
+            # The .listings wrapper renders before its items, so wait for the cards themselves;
+            # find_elements returns [] until then instead of raising on every poll
+            wait.until(lambda d: d.find_elements(By.CSS_SELECTOR, self.selectors['product_containers']))
             logger.info("Page loaded successfully")
         except TimeoutException:
             logger.warning("Timeout waiting for page to load completely.")
 
-    def scroll_to_load_content(self):
+    def scroll_to_load_content(self, driver=None):
         """Scroll down the page to trigger lazy-loading of all products."""
+        driver = driver or self.driver
         try:
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
-            scroll_attempts = 0
             max_scrolls = 5  # Limit scrolling to prevent infinite loops
-            
-            while scroll_attempts < max_scrolls:
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                
-                if new_height == last_height:
-                    break
-                    
-                last_height = new_height
-                scroll_attempts += 1
-                
+            settle_ms = 3000  # How long to wait for lazy-loaded content after each scroll
+            scroll_attempts = driver.execute_async_script(_SCROLL_TO_END_JS, max_scrolls, settle_ms)
             logger.info(f"Completed scrolling after {scroll_attempts} attempts")
             
         except Exception as e:
             logger.warning(f"Error during scrolling: {e}")
 
     def extract_brand_from_title(self, title):
-        """Extract brand from product title using a predefined list."""
-        if not title: 
+        """Extract brand from product title using a predefined list.
+
+        The brand that appears first in the title wins (the longer one if two start together).
+        """
+        if not title:
             return "N/A"
-            
+
         title_upper = title.upper()
-        for brand in self.known_brands:
-            if brand in title_upper:
-                return brand
-                
-        first_word = title.split()[0].upper() if title.split() else "N/A"
+        if self._brand_automaton is not None:
+            # (start, -length, brand) for every match; iter() yields matches by end position
+            matches = [(end - len(brand) + 1, -len(brand), brand)
+                       for end, brand in self._brand_automaton.iter(title_upper)]
+        else:
+            matches = [(title_upper.find(brand), -len(brand), brand)
+                       for brand in self._brands_tuple if brand in title_upper]
+        if matches:
+            return min(matches)[2]
+
+        parts = title.split(maxsplit=1)
+        first_word = parts[0].upper() if parts else ""
         return first_word if len(first_word) > 1 else "N/A"
 
-    def extract_product_info(self, container):
-        """Extract all product information from a single product container element."""
+    def extract_product_info(self, data: dict):
+        """Build a Product from one raw product record (see _node_record)."""
         try:
-            # Product name
-            try:
-                name_element = container.find_element(By.CSS_SELECTOR, self.selectors['product_title'])
-                name = name_element.text.strip()
-            except NoSuchElementException:
-                name = "N/A"
-
-            # Product URL
-            try:
-                link_element = container.find_element(By.CSS_SELECTOR, self.selectors['product_link'])
-                product_url = urljoin(self.base_url, link_element.get_attribute('href'))
-            except NoSuchElementException:
-                product_url = "N/A"
-
-            # Price - current selling price
-            price = "N/A"
-            try:
-                price_element = container.find_element(By.CSS_SELECTOR, self.selectors['product_price'])
-                price = price_element.text.strip()
-            except NoSuchElementException:
-                pass
-
-            # Original price and discount
-            original_price = "N/A"
-            discount = "N/A"
-            try:
-                # Look for strikethrough or old price
-                old_price_elem = container.find_element(By.CSS_SELECTOR, '.old-price, .original-price, [class*="old"], [class*="original"]')
-                original_price = old_price_elem.text.strip()
-            except NoSuchElementException:
-                pass
-
-            try:
-                # Look for discount badge or percentage
-                discount_elem = container.find_element(By.CSS_SELECTOR, '.discount, .discount-tag, [class*="discount"], .percentage-off')
-                discount_text = discount_elem.text.strip()
-                if discount_text:
-                    discount = discount_text
-            except NoSuchElementException:
-                pass
-            
-            # Image URL - improved extraction
-            image_url = "N/A"
-            try:
-                img_element = container.find_element(By.CSS_SELECTOR, self.selectors['product_image'])
-
-                # Try multiple attributes in priority order
-                for attr in ['src', 'data-src', 'data-lazy-src']:
-                    url = img_element.get_attribute(attr)
-                    if url and not url.startswith('data:'):
-                        image_url = url
-                        break
-
-                # If still a data URL or empty, try to get from lazy attribute
-                if image_url == "N/A" or (image_url and image_url.startswith('data:')):
-                    lazy_attr = img_element.get_attribute('lazy')
-                    if lazy_attr:
-                        # Some images use lazy="loading" or lazy="loaded"
-                        data_src = img_element.get_attribute('data-src')
-                        if data_src and not data_src.startswith('data:'):
-                            image_url = data_src
-
-            except NoSuchElementException:
-                pass
+            name = data.get('name') or "N/A"
+            price = data.get('price') or "N/A"
+            original_price = data.get('oldPrice') or "N/A"
+            discount = data.get('discount') or "N/A"
+            product_url = urljoin(self.base_url, data['href']) if data.get('href') else "N/A"
+            image_url = data.get('imgSrc') or "N/A"
 
             # Rating and Reviews
             rating, reviews_count = "N/A", "N/A"
-            try:
-                rating_container = container.find_element(By.CSS_SELECTOR, self.selectors['rating_container'])
-                filled_stars = len(rating_container.find_elements(By.CSS_SELECTOR, '.van-rate__icon--full'))
-                total_stars = len(rating_container.find_elements(By.CSS_SELECTOR, '.van-rate__item'))
-                if total_stars > 0: 
+            if data.get('rating'):
+                filled_stars, total_stars = data['rating']
+                if total_stars > 0:
                     rating = f"{filled_stars}/{total_stars}"
-                
-                reviews_element = container.find_element(By.CSS_SELECTOR, self.selectors['reviews_count'])
-                reviews_match = re.search(r'\((\d+)\)', reviews_element.text.strip())
-                if reviews_match: 
-                    reviews_count = f"{reviews_match.group(1)} reviews"
-            except NoSuchElementException:
-                pass
 
-            # Brand
-            brand = self.extract_brand_from_title(name)
-            
-            # Shipping and Badges
-            shipping_info = "N/A"
-            try:
-                shipping_element = container.find_element(By.CSS_SELECTOR, self.selectors['shipping_badge'])
-                shipping_info = shipping_element.text.strip()
-            except NoSuchElementException: 
-                pass
-            
-            badges = []
-            try:
-                badge_elements = container.find_elements(By.CSS_SELECTOR, '.mark-box > div')
-                badges = [badge.text.strip() for badge in badge_elements if badge.text.strip()]
-            except NoSuchElementException: 
-                pass
+                reviews_match = _REVIEWS_RE.search(data.get('reviewsText') or '')
+                if reviews_match:
+                    reviews_count = f"{reviews_match.group(1)} reviews"
 
             return Product(
                 name=name,
@@ -346,136 +477,210 @@ class KilimallScraper:
                 reviews_count=reviews_count,
                 image_url=image_url,
                 product_url=product_url,
-                brand=brand,
+                brand=self.extract_brand_from_title(name),
                 category="Electronics",
-                shipping_info=shipping_info,
-                badges=badges
+                shipping_info=data.get('shipping') or "N/A",
+                badges=data.get('badges') or []
             )
-            
+
         except Exception as e:
             logger.error(f"Error extracting product info: {e}")
             return None
 
-    def scrape_category(self, category_url: str, max_pages: int = 5, progress_callback=None) -> List[Product]:
-        """Scrape products from a category URL."""
-        logger.info(f"Starting category scrape from '{category_url}' across {max_pages} pages.")
-        all_products = []
+    @staticmethod
+    def _node_text(node, selector: str) -> str:
+        """Return the whitespace-normalised text of the first match of selector under node, or ''."""
+        match = node.css_first(selector)
+        return _normalize_text(match.text()) if match is not None else ''
+
+    def _node_record(self, node) -> dict:
+        """Build the raw product record that extract_product_info expects from a selectolax node."""
+        link = node.css_first(self.selectors['product_link'])
+        img = node.css_first(self.selectors['product_image'])
+        rate = node.css_first(self.selectors['rating_container'])
+
+        rating = None
+        if rate is not None:
+            # One pass over the rating subtree counts both filled and total stars
+            rating = [0, 0]
+            for star in rate.css('.van-rate__icon--full, .van-rate__item'):
+                is_item = 'van-rate__item' in (star.attributes.get('class') or '').split()
+                rating[1 if is_item else 0] += 1
+
+        img_src = ''
+        if img is not None:
+            for attr in ['src', 'data-src', 'data-lazy-src']:
+                url = img.attributes.get(attr)
+                if url and not url.startswith('data:'):
+                    img_src = url
+                    break
 
-        try:
-            for page in range(1, max_pages + 1):
-                try:
-                    # Update progress
-                    if progress_callback:
-                        progress = (page - 1) / max_pages * 90
-                        progress_callback(f"Scraping page {page}/{max_pages}...", progress)
+        return {
+            'name': self._node_text(node, self.selectors['product_title']),
+            'price': self._node_text(node, self.selectors['product_price']),
+            'oldPrice': self._node_text(node, self.selectors['old_price']),
+            'discount': self._node_text(node, self.selectors['discount']),
+            'href': link.attributes.get('href') if link is not None else '',
+            'imgSrc': img_src,
+            'rating': rating,
+            'reviewsText': self._node_text(node, self.selectors['reviews_count']),
+            'shipping': self._node_text(node, self.selectors['shipping_badge']),
+            'badges': [text for text in (_normalize_text(badge.text()) for badge in node.css('.mark-box > div')) if text]
+        }
 
-                    # Modify URL to include page number
-                    # Remove existing page parameter if present
-                    import re
-                    base_url = re.sub(r'[&?]page=\d+', '', category_url)
+    def parse_products(self, html: str) -> List[Product]:
+        """Parse every product container out of a listing page's HTML with selectolax."""
+        tree = HTMLParser(html)
+        products = []
+        for node in tree.css(self.selectors['product_containers']):
+            product = self.extract_product_info(self._node_record(node))
+            if product:
+                products.append(product)
+        return products
+
+    def extract_page_products(self, driver=None) -> List[Product]:
+        """Extract every product on the current page in a single WebDriver round-trip.
+
+        The page HTML is fetched once and parsed locally with selectolax.
+        """
+        driver = driver or self.driver
+        products = self.parse_products(driver.page_source)
+        logger.info(f"Parsed {len(products)} products from page source")
+        return products
+
+    def _scrape_page(self, driver, page: int, page_url: str) -> List[Product]:
+        """Load one listing page on the given driver and extract its products."""
+        # Randomized per-page delay keeps parallel workers from hitting the site in lockstep
+        if page > 1:
+            delay = random.uniform(*self.delay_range)
+            logger.info(f"Waiting {delay:.1f} seconds before page {page}...")
+            time.sleep(delay)
 
-                    # Add page parameter
-                    if '?' in base_url:
-                        page_url = f"{base_url}&page={page}"
-                    else:
-                        page_url = f"{base_url}?page={page}"
-
-                    logger.info(f"Navigating to category page {page}: {page_url}")
+        try:
+            logger.info(f"Navigating to page {page}: {page_url}")
+            driver.get(page_url)
+            self.wait_for_page_load(driver)
+            self.scroll_to_load_content(driver)
 
-                    self.driver.get(page_url)
-                    self.wait_for_page_load()
-                    self.scroll_to_load_content()
+            page_products = self.extract_page_products(driver)
+            logger.info(f"Extracted {len(page_products)} products from page {page}")
+            return page_products
 
-                    # Find product containers
-                    product_containers = self.driver.find_elements(By.CSS_SELECTOR, self.selectors['product_containers'])
-                    logger.info(f"Found {len(product_containers)} product containers on page {page}")
+        except TimeoutException:
+            logger.warning(f"Timeout on page {page}, skipping...")
+        except Exception as e:
+            logger.error(f"Error on page {page}: {e}")
+        return []
+
+    def _scrape_pages(self, page_urls: List[str], progress_callback=None, output_stream=None):
+        """Scrape listing pages in parallel, one Chrome driver per worker thread.
+
+        This scraper's own driver serves one worker; the others borrow warm drivers from
+        the shared pool and hand them back afterwards. Returns (products, product_count),
+        with products in page order (empty when streaming to output_stream, where pages
+        are written as they complete).
+        """
+        max_pages = len(page_urls)
+        drivers = queue.LifoQueue()
+        drivers.put(self.driver)
+        borrowed = []
+
+        def scrape_on_free_driver(page, page_url):
+            try:
+                driver = drivers.get_nowait()
+            except queue.Empty:
+                try:
+                    driver = self.acquire(self.headless, block=False)
+                except Exception as e:
+                    logger.warning(f"Could not launch an extra Chrome driver for page {page}: {e}")
+                    driver = None
+                if driver is None:
+                    # Driver cap reached or launch failed: wait for one this scrape already holds
+                    driver = drivers.get()
+                else:
+                    borrowed.append(driver)
+            try:
+                return self._scrape_page(driver, page, page_url)
+            finally:
+                drivers.put(driver)
 
-                    page_products = []
-                    for container in product_containers:
-                        product = self.extract_product_info(container)
-                        if product:
-                            page_products.append(product)
+        results = {}
+        product_count = 0
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, max_pages))) as executor:
+                futures = {
+                    executor.submit(scrape_on_free_driver, page, page_url): page
+                    for page, page_url in enumerate(page_urls, 1)
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    try:
+                        page_products = future.result()
+                    except Exception as e:
+                        logger.error(f"Error on page {futures[future]}: {e}")
+                        page_products = []
+                    product_count += len(page_products)
+                    if output_stream is not None:
+                        save_to_jsonl(page_products, output_stream)
+                    else:
+                        results[futures[future]] = page_products
 
-                    all_products.extend(page_products)
-                    logger.info(f"Extracted {len(page_products)} products from page {page}")
+                    if progress_callback:
+                        progress = done / max_pages * 90  # Reserve 10% for final processing
+                        progress_callback(f"Scraped {done}/{max_pages} pages...", progress)
+        finally:
+            for driver in borrowed:
+                self.release(driver, self.headless)
+
+        all_products = [product for page in sorted(results) for product in results[page]]
+        return all_products, product_count
+
+    def scrape_category(self, category_url: str, max_pages: int = 5, progress_callback=None,
+                        output_stream=None) -> List[Product]:
+        """Scrape products from a category URL.
+
+        If output_stream (a binary file) is given, each page's products are written to it
+        as JSON Lines instead of being collected, and an empty list is returned.
+        """
+        logger.info(f"Starting category scrape from '{category_url}' across {max_pages} pages.")
+        all_products = []
 
-                    # Delay between pages
-                    if page < max_pages:
-                        delay = random.uniform(*self.delay_range)
-                        logger.info(f"Waiting {delay:.1f} seconds before next page...")
-                        time.sleep(delay)
+        try:
+            page_urls = _category_page_urls(category_url, max_pages)
 
-                except TimeoutException:
-                    logger.warning(f"Timeout on page {page}, skipping...")
-                    continue
-                except Exception as e:
-                    logger.error(f"Error on page {page}: {e}")
-                    continue
+            all_products, product_count = self._scrape_pages(page_urls, progress_callback, output_stream)
 
             # Final progress update
             if progress_callback:
-                progress_callback(f"Scraping completed! Found {len(all_products)} products", 100)
+                progress_callback(f"Scraping completed! Found {product_count} products", 100)
 
-            logger.info(f"Category scrape complete. Total products found: {len(all_products)}")
+            logger.info(f"Category scrape complete. Total products found: {product_count}")
             return all_products
 
         except Exception as e:
             logger.error(f"Critical error during category scrape: {e}")
             return all_products
 
-    def search_products(self, query: str, max_pages: int = 5, progress_callback=None) -> List[Product]:
-        """Search for products sequentially (no multiprocessing)."""
-        logger.info(f"Starting sequential search for '{query}' across {max_pages} pages.")
+    def search_products(self, query: str, max_pages: int = 5, progress_callback=None,
+                        output_stream=None) -> List[Product]:
+        """Search for products, scraping result pages in parallel.
+
+        If output_stream (a binary file) is given, each page's products are written to it
+        as JSON Lines instead of being collected, and an empty list is returned.
+        """
+        logger.info(f"Starting parallel search for '{query}' across {max_pages} pages.")
         all_products = []
 
         try:
-            for page in range(1, max_pages + 1):
-                try:
-                    # Update progress
-                    if progress_callback:
-                        progress = (page - 1) / max_pages * 90  # Reserve 10% for final processing
-                        progress_callback(f"Scraping page {page}/{max_pages}...", progress)
-
-                    search_url = f"{self.base_url}/search?q={query}&page={page}"
-                    logger.info(f"Navigating to page {page}: {search_url}")
-
-                    self.driver.get(search_url)
-                    self.wait_for_page_load()
-                    self.scroll_to_load_content()
-
-                    # Find product containers
-                    product_containers = self.driver.find_elements(By.CSS_SELECTOR, self.selectors['product_containers'])
-                    logger.info(f"Found {len(product_containers)} product containers on page {page}")
-
-                    page_products = []
-                    for container in product_containers:
-                        product = self.extract_product_info(container)
-                        if product:
-                            page_products.append(product)
-                    
-                    all_products.extend(page_products)
-                    logger.info(f"Extracted {len(page_products)} products from page {page}")
-                    
-                    # Delay between pages to be respectful
-                    if page < max_pages:
-                        delay = random.uniform(*self.delay_range)
-                        logger.info(f"Waiting {delay:.1f} seconds before next page...")
-                        time.sleep(delay)
-                        
-                except TimeoutException:
-                    logger.warning(f"Timeout on page {page}, skipping...")
-                    continue
-                except Exception as e:
-                    logger.error(f"Error on page {page}: {e}")
-                    continue
-            
+            page_urls = [f"{self.base_url}/search?q={query}&page={page}" for page in range(1, max_pages + 1)]
+            all_products, product_count = self._scrape_pages(page_urls, progress_callback, output_stream)
+
             # Final progress update
             if progress_callback:
-                progress_callback(f"Scraping completed! Found {len(all_products)} products", 100)
-            
-            logger.info(f"Sequential search complete. Total products found: {len(all_products)}")
+                progress_callback(f"Scraping completed! Found {product_count} products", 100)
+
+            logger.info(f"Parallel search complete. Total products found: {product_count}")
             return all_products
-            
+
         except Exception as e:
             logger.error(f"Critical error during search: {e}")
             return all_products
@@ -496,19 +701,9 @@ class KilimallScraper:
                         pass
 
                 self.driver = None
+                _DRIVER_SLOTS.release()
                 logger.info("Browser closed successfully")
 
-                # Additional cleanup on Windows
-                if os.name == 'nt':
-                    try:
-                        import subprocess
-                        # Kill any remaining chrome/chromedriver processes
-                        subprocess.run(['taskkill', '/F', '/IM', 'chromedriver.exe'],
-                                     capture_output=True, timeout=2)
-                        time.sleep(0.5)
-                    except:
-                        pass
-
         except Exception as e:
             logger.error(f"Error during driver cleanup: {e}")
 
@@ -517,49 +712,219 @@ class KilimallScraper:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
+        # Hand the warm browser back to the pool instead of quitting it
+        if self.driver:
+            self.release(self.driver, self.headless)
+            self.driver = None
+            self.wait = None
+
+class AsyncKilimallScraper:
+    """
+    Browser-free scraper: fetches listing pages concurrently over a pooled httpx
+    client, staggering request starts by delay_range, and parses the HTML with
+    selectolax. Falls back to the Selenium KilimallScraper when the listing HTML
+    has no products (Vue hydration needed).
+    """
+
+    def __init__(self, headless: bool = True, delay_range: tuple = (2, 4), max_connections: int = 20):
+        if not ASYNC_SCRAPER_AVAILABLE:
+            raise ImportError("AsyncKilimallScraper requires httpx (pip install 'httpx[http2]')")
+        self.headless = headless
+        self.delay_range = delay_range
+        self.max_connections = max_connections
+        self.client = None
+
+        # Shares selectors, HTML parsing and brand matching with the Selenium scraper (no browser is started)
+        self.browser_scraper = KilimallScraper(headless=headless, delay_range=delay_range)
+        self.base_url = self.browser_scraper.base_url
+        self.selectors = self.browser_scraper.selectors
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            headers={'User-Agent': _USER_AGENT},
+            timeout=30,
+            follow_redirects=True
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    async def fetch_page(self, url: str, params: Optional[dict] = None) -> str:
+        """Fetch a single listing page and return its HTML."""
+        response = await self.client.get(url, params=params)
+        response.raise_for_status()
+        return response.text
+
+    async def _fetch_numbered_page(self, page: int, url: str, params: Optional[dict], delay: float = 0):
+        """Fetch one page after delay seconds, returning (page, html or the exception raised)."""
+        if delay:
+            logger.info(f"Waiting {delay:.1f} seconds before page {page}...")
+            await asyncio.sleep(delay)
+        try:
+            return page, await self.fetch_page(url, params)
+        except Exception as e:
+            return page, e
+
+    async def _scrape_pages(self, pages: list, progress_callback=None, output_stream=None):
+        """Fetch (url, params) pairs concurrently, parsing each page as soon as it arrives.
+
+        Returns (products, product_count), with products in page order (empty when streaming
+        to output_stream, where pages are written as they complete).
+        """
+        max_pages = len(pages)
+        if progress_callback:
+            progress_callback(f"Fetching {max_pages} pages...", 0)
+
+        # Start one request every delay_range seconds (randomized) instead of all at once;
+        # responses still overlap, and each page is parsed as soon as it arrives
+        fetches = []
+        start_delay = 0
+        for page, (url, params) in enumerate(pages, 1):
+            if page > 1:
+                start_delay += random.uniform(*self.delay_range)
+            fetches.append(self._fetch_numbered_page(page, url, params, start_delay))
+
+        results = {}
+        product_count = 0
+        for done, fetch in enumerate(asyncio.as_completed(fetches), 1):
+            page, html = await fetch
+            if isinstance(html, Exception):
+                logger.error(f"Error on page {page}: {html}")
+                page_products = []
+            else:
+                page_products = self.browser_scraper.parse_products(html)
+                logger.info(f"Extracted {len(page_products)} products from page {page}")
+
+            product_count += len(page_products)
+            if output_stream is not None:
+                save_to_jsonl(page_products, output_stream)
+            else:
+                results[page] = page_products
+
+            if progress_callback:
+                progress = done / max_pages * 90  # Reserve 10% for final processing
+                progress_callback(f"Scraped {done}/{max_pages} pages...", progress)
+
+        all_products = [product for page in sorted(results) for product in results[page]]
+        return all_products, product_count
+
+    def _browser_fallback(self, method_name: str, *args, **kwargs) -> List[Product]:
+        """Run the equivalent Selenium scrape for pages that need Vue hydration."""
+        with KilimallScraper(headless=self.headless, delay_range=self.delay_range) as scraper:
+            return getattr(scraper, method_name)(*args, **kwargs)
+
+    async def _scrape_or_fallback(self, pages: list, method_name: str, target: str, max_pages: int,
+                                  progress_callback=None, output_stream=None) -> List[Product]:
+        all_products, product_count = await self._scrape_pages(pages, progress_callback, output_stream)
+
+        if not product_count:
+            logger.info("No products in server-rendered HTML, falling back to Selenium for Vue hydration")
+            return await asyncio.to_thread(self._browser_fallback, method_name, target, max_pages,
+                                           progress_callback=progress_callback, output_stream=output_stream)
+
+        if progress_callback:
+            progress_callback(f"Scraping completed! Found {product_count} products", 100)
+
+        logger.info(f"HTTP scrape complete. Total products found: {product_count}")
+        return all_products
+
+    async def scrape_category(self, category_url: str, max_pages: int = 5, progress_callback=None,
+                              output_stream=None) -> List[Product]:
+        """Scrape products from a category URL, fetching pages concurrently."""
+        logger.info(f"Starting HTTP category scrape from '{category_url}' across {max_pages} pages.")
+        pages = [(page_url, None) for page_url in _category_page_urls(category_url, max_pages)]
+        return await self._scrape_or_fallback(pages, 'scrape_category', category_url, max_pages,
+                                              progress_callback, output_stream)
+
+    async def search_products(self, query: str, max_pages: int = 5, progress_callback=None,
+                              output_stream=None) -> List[Product]:
+        """Search for products, fetching result pages concurrently."""
+        logger.info(f"Starting HTTP search for '{query}' across {max_pages} pages.")
+        pages = [(f"{self.base_url}/search", {'q': query, 'page': page}) for page in range(1, max_pages + 1)]
+        return await self._scrape_or_fallback(pages, 'search_products', query, max_pages,
+                                              progress_callback, output_stream)
 
 def save_to_json(products: List[Product], filename: str = "kilimall_products.json"):
     """Save products to JSON file"""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump([product.__dict__ for product in products], f, indent=2, ensure_ascii=False)
+        with open(filename, 'wb') as f:
+            f.write(msgspec.json.format(msgspec.json.encode(products), indent=2))
         logger.info(f"Saved {len(products)} products to {filename}")
     except Exception as e:
         logger.error(f"Error saving to JSON: {e}")
 
+_JSONL_ENCODER = msgspec.json.Encoder()
+
+def save_to_jsonl(products: List[Product], stream):
+    """Append products to a binary stream as JSON Lines (one product per line)"""
+    stream.write(_JSONL_ENCODER.encode_lines(products))
+
 def main():
     """Main function for testing"""
     parser = argparse.ArgumentParser(description='Scrape products from Kilimall Kenya')
     parser.add_argument('--search', type=str, help='Search query for products')
     parser.add_argument('--category', type=str, help='Category URL to scrape')
     parser.add_argument('--pages', type=int, default=2, help='Number of pages to scrape (default: 2)')
-    parser.add_argument('--output', type=str, default='kilimall_products.json', help='Output filename')
+    parser.add_argument('--output', type=str,
+                        help='Output filename (default: kilimall_products.json, or kilimall_products.jsonl with --stream)')
     parser.add_argument('--headless', action='store_true', help='Run browser in headless mode')
+    parser.add_argument('--http', action='store_true',
+                        help='Fetch pages over HTTP (httpx + selectolax) instead of driving Chrome')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write products to --output as JSON Lines (one product per line) after each page '
+                             'instead of holding them in memory')
 
     args = parser.parse_args()
 
     if not args.search and not args.category:
         parser.error("Please provide either --search or --category")
 
+    if not args.output:
+        args.output = 'kilimall_products.jsonl' if args.stream else 'kilimall_products.json'
+
     def progress_update(message, progress):
         print(f"Progress: {progress:.1f}% - {message}")
 
-    with KilimallScraper(headless=args.headless) as scraper:
-        if args.category:
-            print(f"Scraping category: {args.category}")
-            products = scraper.scrape_category(args.category, max_pages=args.pages, progress_callback=progress_update)
-        else:
-            print(f"Searching for: {args.search}")
-            products = scraper.search_products(args.search, max_pages=args.pages, progress_callback=progress_update)
-
-        if products:
-            save_to_json(products, args.output)
-            print(f"\nSuccessfully scraped {len(products)} products!")
-            for i, product in enumerate(products[:5], 1):  # Show first 5
-                print(f"{i}. {product.name} - {product.price}")
+    async def scrape_over_http(output_stream):
+        async with AsyncKilimallScraper(headless=args.headless) as scraper:
+            if args.category:
+                return await scraper.scrape_category(args.category, max_pages=args.pages,
+                                                     progress_callback=progress_update, output_stream=output_stream)
+            return await scraper.search_products(args.search, max_pages=args.pages,
+                                                 progress_callback=progress_update, output_stream=output_stream)
+
+    if args.category:
+        print(f"Scraping category: {args.category}")
+    else:
+        print(f"Searching for: {args.search}")
+
+    with (open(args.output, 'wb') if args.stream else nullcontext()) as output_stream:
+        if args.http:
+            products = asyncio.run(scrape_over_http(output_stream))
         else:
-            print("No products found!")
+            with KilimallScraper(headless=args.headless) as scraper:
+                if args.category:
+                    products = scraper.scrape_category(args.category, max_pages=args.pages,
+                                                       progress_callback=progress_update, output_stream=output_stream)
+                else:
+                    products = scraper.search_products(args.search, max_pages=args.pages,
+                                                       progress_callback=progress_update, output_stream=output_stream)
+
+    if args.stream:
+        print(f"\nProducts streamed to {args.output}")
+    elif products:
+        save_to_json(products, args.output)
+        print(f"\nSuccessfully scraped {len(products)} products!")
+        for i, product in enumerate(products[:5], 1):  # Show first 5
+            print(f"{i}. {product.name} - {product.price}")
+    else:
+        print("No products found!")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,9 +1,11 @@
 # kilimall_worker.py - WebExtract Pro Worker (Fixed HTML Serving)
 from flask import Flask, send_from_directory, request, jsonify, make_response
 from flask_cors import CORS
+import asyncio
 import threading
 import time
 import json
+from contextlib import ExitStack
 from datetime import datetime
 import os
 import sys
@@ -43,15 +45,19 @@ if SHARED_DB_AVAILABLE:
 
 # Import your existing scraper
 SCRAPER_AVAILABLE = False
+ASYNC_SCRAPER_AVAILABLE = False
 KilimallScraper = None
+AsyncKilimallScraper = None
 
 try:
     # Import your KilimallScraper class
-    from kilimall_scraper import KilimallScraper
+    from kilimall_scraper import KilimallScraper, AsyncKilimallScraper, ASYNC_SCRAPER_AVAILABLE
     SCRAPER_AVAILABLE = True
     print("[OK] KilimallScraper class imported successfully")
     print("[OK] Your trained Selenium-based scraper is ready")
     print("[OK] Using exact selectors from real Kilimall HTML analysis")
+    if ASYNC_SCRAPER_AVAILABLE:
+        print("[OK] HTTP scraping enabled (Selenium fallback for Vue-rendered pages)")
 except ImportError as e:
     print(f"[WARN] Could not import KilimallScraper: {e}")
     print("[WARN] Make sure kilimall_scraper.py is in the workers/kilimall/ directory")
@@ -141,8 +147,8 @@ def complete_scraping_session_safe(task_id, products_data, status='completed', e
                         # Convert Product objects to dictionaries if needed
                         json_products = []
                         for product in products_data:
-                            if hasattr(product, '__dict__'):
-                                # Convert dataclass/object to dict
+                            if not isinstance(product, dict):
+                                # Convert Product struct/object to dict
                                 product_dict = {
                                     'name': getattr(product, 'name', 'N/A'),
                                     'price': getattr(product, 'price', 'N/A'),
@@ -726,6 +732,11 @@ def get_stats():
             'error': str(e)
         }), 500
 
+async def scrape_over_http(scraper_options, method_name, *args):
+    """Run one AsyncKilimallScraper scrape; it starts Selenium itself only if the HTML has no products"""
+    async with AsyncKilimallScraper(**scraper_options) as scraper:
+        return await getattr(scraper, method_name)(*args)
+
 def run_kilimall_scraper(task_id, search_query, category_url, max_pages, scrape_mode):
     """Run your existing KilimallScraper with proper configuration"""
     def update_progress(progress, message, products=None):
@@ -739,11 +750,11 @@ def run_kilimall_scraper(task_id, search_query, category_url, max_pages, scrape_
                     })
                     
                     if products:
-                        # Convert Product dataclass objects to dictionaries
+                        # Convert Product objects to dictionaries
                         products_dict = []
                         for product in products:
-                            if hasattr(product, '__dict__'):
-                                # Convert dataclass to dict
+                            if not isinstance(product, dict):
+                                # Convert Product struct to dict
                                 product_dict = {
                                     'name': getattr(product, 'name', 'N/A'),
                                     'price': getattr(product, 'price', 'N/A'),
@@ -788,7 +799,7 @@ def run_kilimall_scraper(task_id, search_query, category_url, max_pages, scrape_
         )
     
     try:
-        update_progress(5, "Setting up Selenium browser with real HTML selectors...")
+        update_progress(5, "Setting up scraper with real HTML selectors...")
         
         # Initialize your KilimallScraper
         scraper_options = {
@@ -796,8 +807,16 @@ def run_kilimall_scraper(task_id, search_query, category_url, max_pages, scrape_
             'delay_range': (1, 3)
         }
         
-        with KilimallScraper(**scraper_options) as scraper:
-            update_progress(10, "Browser initialized with enhanced Chrome options...")
+        with ExitStack() as stack:
+            if ASYNC_SCRAPER_AVAILABLE:
+                def scrape(method_name, target):
+                    return asyncio.run(scrape_over_http(scraper_options, method_name, target, max_pages))
+                update_progress(10, "HTTP client ready (Selenium fallback for Vue-rendered pages)...")
+            else:
+                scraper = stack.enter_context(KilimallScraper(**scraper_options))
+                def scrape(method_name, target):
+                    return getattr(scraper, method_name)(target, max_pages)
+                update_progress(10, "Browser initialized with enhanced Chrome options...")
             
             all_products = []
             
@@ -805,7 +824,7 @@ def run_kilimall_scraper(task_id, search_query, category_url, max_pages, scrape_
                 update_progress(15, f"Scraping category: {category_url}")
                 
                 try:
-                    products = scraper.scrape_category(category_url, max_pages)
+                    products = scrape('scrape_category', category_url)
                     if products:
                         all_products.extend(products)
                         update_progress(85, f"Category scraping completed - found {len(products)} products", products)
@@ -819,7 +838,7 @@ def run_kilimall_scraper(task_id, search_query, category_url, max_pages, scrape_
                 update_progress(15, f"Searching for: {search_query}")
                 
                 try:
-                    products = scraper.search_products(search_query, max_pages)
+                    products = scrape('search_products', search_query)
                     if products:
                         all_products.extend(products)
                         update_progress(85, f"Search completed - found {len(products)} products", products)